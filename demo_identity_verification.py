@@ -19,31 +19,106 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from identity_verifier import IdentityVerifier
+from drawing_utils import blend_rect
 import cv2
 import numpy as np
 
 
+class MotionGate:
+    """
+    Cheap frame-difference gate in front of landmark detection.
+    
+    Each frame is shrunk to a tiny grayscale thumbnail and compared with the
+    thumbnail of the last frame that was actually detected. While the scene
+    stays unchanged the previous landmarks can be reused, up to
+    max_stale_frames frames in a row before a refresh is forced.
+    """
+    
+    def __init__(self, threshold: float = 2.0, max_stale_frames: int = 15,
+                 thumb_size: tuple = (32, 24)):
+        """
+        Initialize motion gate.
+        
+        Args:
+            threshold: Mean absolute thumbnail difference (0-255) that counts as motion
+            max_stale_frames: Maximum consecutive frames that may reuse old results
+            thumb_size: (width, height) of the comparison thumbnail
+        """
+        self.threshold = threshold
+        self.max_stale_frames = max_stale_frames
+        self.thumb_size = thumb_size
+        self.last_thumb = None
+        self.stale_frames = 0
+        self.skipped = 0
+    
+    def changed(self, frame: np.ndarray) -> bool:
+        """Return True if frame needs fresh detection, False if results can be reused."""
+        # Resize first so the color conversion only touches the thumbnail
+        small = cv2.resize(frame, self.thumb_size, interpolation=cv2.INTER_AREA)
+        thumb = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        
+        if (self.last_thumb is None
+                or self.stale_frames >= self.max_stale_frames
+                or cv2.absdiff(thumb, self.last_thumb).mean() > self.threshold):
+            self.last_thumb = thumb
+            self.stale_frames = 0
+            return True
+        
+        self.stale_frames += 1
+        self.skipped += 1
+        return False
+    
+    def force_refresh(self):
+        """Force the next frame to be detected."""
+        self.last_thumb = None
+
+
 class InteractiveDemo:
     """Interactive demo for testing identity verification."""
     
-    def __init__(self):
-        """Initialize demo."""
+    def __init__(self, skip_duplicate_samples: bool = False,
+                 min_sample_change: float = 0.01, max_skipped_samples: int = 5,
+                 min_enroll_samples: int = 20):
+        """
+        Initialize demo.
+        
+        Args:
+            skip_duplicate_samples: Skip enrollment frames whose face shape barely
+                changed since the last accepted sample
+            min_sample_change: Minimum mean landmark displacement, relative to
+                face size, for a frame to count as a new sample
+            max_skipped_samples: Number of consecutive duplicates (K) after which
+                the face counts as converged; before min_enroll_samples is
+                reached, a frame is accepted anyway instead
+            min_enroll_samples: Samples required before enrollment may stop
+                early on convergence
+        
+        Duplicate skipping trades accuracy for speed: a converged enrollment
+        bundles far fewer samples than target_samples, and its accuracy has
+        not been measured against the full 200-frame enrollment.
+        """
         # Use 200 frames for maximum robust HDC training (best accuracy!)
         self.verifier = IdentityVerifier(hv_dim=15000, levels=150, enrollment_samples=200)
         self.current_user = None
         self.mode = "idle"
-        self.enrollment_samples = []
+        self.enrollment_count = 0  # Only count frames; the verifier keeps the samples
         self.target_samples = 200  # Collect 200 frames for excellent accuracy (~94%)
         self.frame_skip = 0  # Collect every frame (no skipping)
+        self.motion_gate = MotionGate()
+        self.last_landmarks = None
+        self.skip_duplicate_samples = skip_duplicate_samples
+        self.min_sample_change = min_sample_change
+        self.max_skipped_samples = max_skipped_samples
+        self.min_enroll_samples = min_enroll_samples
+        self.last_sample_shape = None
+        self.skipped_samples = 0
         
     def draw_ui(self, frame: np.ndarray) -> np.ndarray:
         """Draw user interface on frame."""
         h, w = frame.shape[:2]
-        overlay = frame.copy()
         
         # Semi-transparent background for text
-        cv2.rectangle(overlay, (0, 0), (w, 120), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.6, frame, 0.4, 0, frame)
+        blend_rect(frame, 0, 0, w, 120, (0, 0, 0), 0.6)
         
         # Title
         cv2.putText(frame, "HDC IDENTITY VERIFICATION SYSTEM", 
@@ -72,7 +147,7 @@ class InteractiveDemo:
         
         # Enrollment progress
         if self.mode == 'enrolling':
-            progress = len(self.enrollment_samples)
+            progress = self.enrollment_count
             progress_text = f"Collecting: {progress}/{self.target_samples} frames"
             progress_pct = (progress / self.target_samples) * 100
             cv2.putText(frame, progress_text, (10, 115), 
@@ -103,7 +178,6 @@ class InteractiveDemo:
     def show_result(self, frame: np.ndarray, result: dict, duration: int = 2000):
         """Show result overlay."""
         h, w = frame.shape[:2]
-        overlay = frame.copy()
         
         # Result box
         box_h = 150
@@ -112,8 +186,7 @@ class InteractiveDemo:
         box_y = (h - box_h) // 2
         
         # Background
-        cv2.rectangle(overlay, (box_x, box_y), (box_x + box_w, box_y + box_h), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.8, frame, 0.2, 0, frame)
+        blend_rect(frame, box_x, box_y, box_x + box_w, box_y + box_h, (0, 0, 0), 0.8)
         
         # Border color based on result
         if 'verified' in result:
@@ -144,29 +217,70 @@ class InteractiveDemo:
         cv2.imshow('Identity Verification Demo', frame)
         cv2.waitKey(duration)
     
-    def enroll_mode(self, frame: np.ndarray):
+    @staticmethod
+    def face_shape(landmarks: np.ndarray) -> np.ndarray:
+        """Landmark (x, y) positions with translation and scale removed."""
+        points = landmarks[:, :2] - landmarks[:, :2].mean(axis=0)
+        scale = np.sqrt((points ** 2).sum(axis=1).mean())
+        return points / scale if scale > 0 else points
+    
+    def reset_enrollment(self):
+        """Clear per-enrollment counters."""
+        self.enrollment_count = 0
+        self.last_sample_shape = None
+        self.skipped_samples = 0
+    
+    def is_duplicate_sample(self, landmarks: np.ndarray) -> bool:
+        """Check whether landmarks are a near-duplicate of the last accepted sample."""
+        if self.last_sample_shape is None:
+            return False
+        change = np.linalg.norm(self.face_shape(landmarks) - self.last_sample_shape, axis=1).mean()
+        return change < self.min_sample_change
+    
+    def enroll_mode(self, frame: np.ndarray, landmarks: np.ndarray = None):
         """Handle enrollment - fast collection."""
         if self.current_user is None:
             return
         
+        target = self.target_samples
+        
+        # Skip redundant frames before they pay for detection and encoding
+        if self.skip_duplicate_samples and landmarks is not None:
+            if self.is_duplicate_sample(landmarks):
+                self.skipped_samples += 1
+                if self.skipped_samples < self.max_skipped_samples:
+                    return
+                
+                # K duplicates in a row: the face has stopped changing. With
+                # enough samples, finish on this frame; otherwise accept it so
+                # a still subject keeps collecting samples.
+                if self.enrollment_count >= self.min_enroll_samples:
+                    # Assumes enroll_user (src/identity_verifier.py, not in this
+                    # tree) completes once its sample count reaches the
+                    # num_samples passed on that call
+                    target = self.enrollment_count + 1
+            
+            self.last_sample_shape = self.face_shape(landmarks)
+            self.skipped_samples = 0
+        
         # Fast collection: enroll every frame
-        result = self.verifier.enroll_user(self.current_user, frame, num_samples=self.target_samples)
+        result = self.verifier.enroll_user(self.current_user, frame, num_samples=target)
         
         if result['success']:
-            self.enrollment_samples.append(frame)
+            self.enrollment_count += 1
             
             # Show progress in terminal every 10 frames
-            if len(self.enrollment_samples) % 10 == 0:
-                pct = (len(self.enrollment_samples) / self.target_samples) * 100
-                print(f"   Progress: {len(self.enrollment_samples)}/{self.target_samples} ({pct:.0f}%)")
+            if self.enrollment_count % 10 == 0:
+                pct = (self.enrollment_count / self.target_samples) * 100
+                print(f"   Progress: {self.enrollment_count}/{self.target_samples} ({pct:.0f}%)")
             
             if 'enrolled successfully' in result['message']:
                 self.show_result(frame, {
-                    'message': f"✅ {self.current_user} enrolled with {len(self.enrollment_samples)} frames!",
+                    'message': f"✅ {self.current_user} enrolled with {self.enrollment_count} frames!",
                     'confidence': 1.0
                 })
                 self.mode = 'idle'
-                self.enrollment_samples = []
+                self.reset_enrollment()
                 self.current_user = None
     
     def verify_mode(self, frame: np.ndarray):
@@ -234,6 +348,7 @@ class InteractiveDemo:
         print(f"  Updates: {stats['updates']}")
         print(f"  Detections: {stats['detections']}")
         print(f"  Detection failures: {stats['detection_failures']}")
+        print(f"  Display detections skipped (static scene): {self.motion_gate.skipped}")
         
         print(f"\nEnrolled Users: {stats['num_enrolled_users']}")
         for user in self.verifier.get_enrolled_users():
@@ -283,8 +398,11 @@ class InteractiveDemo:
                 print("❌ Error reading frame")
                 break
             
-            # Detect landmarks and draw them on frame
-            landmarks = self.verifier.detector.detect(frame)
+            # Detect landmarks and draw them on frame (reused while the scene is
+            # static, except during enrollment where duplicate checks need fresh ones)
+            if self.mode == 'enrolling' or self.motion_gate.changed(frame):
+                self.last_landmarks = self.verifier.detector.detect(frame)
+            landmarks = self.last_landmarks
             
             if landmarks is not None:
                 # Draw all 478 keypoints (green dots)
@@ -294,7 +412,7 @@ class InteractiveDemo:
             
             # Process based on mode
             if self.mode == 'enrolling':
-                self.enroll_mode(display_frame)
+                self.enroll_mode(display_frame, landmarks)
             elif self.mode == 'verifying':
                 self.verify_mode(display_frame)
             elif self.mode == 'identifying':
@@ -321,9 +439,11 @@ class InteractiveDemo:
                 if user_id:
                     self.current_user = user_id
                     self.mode = 'enrolling'
-                    self.enrollment_samples = []
+                    self.motion_gate.force_refresh()
+                    self.reset_enrollment()
                     print(f"📝 Enrolling {user_id}...")
-                    print(f"   Collecting {self.target_samples} frames automatically...")
+                    print(f"   Collecting {'up to ' if self.skip_duplicate_samples else ''}"
+                          f"{self.target_samples} frames automatically...")
                     print(f"   Stay still and look at the camera!")
             
             elif key == ord('v'):
@@ -332,12 +452,14 @@ class InteractiveDemo:
                 if user_id:
                     self.current_user = user_id
                     self.mode = 'verifying'
+                    self.motion_gate.force_refresh()
                     print(f"🔍 Verifying {user_id}. Look at camera and press any key...")
                     print(f"   Note: Need confidence > 0.75 to verify")
             
             elif key == ord('i'):
                 # Identify
                 self.mode = 'identifying'
+                self.motion_gate.force_refresh()
                 self.identify_mode(frame)
             
             elif key == ord('u'):
@@ -346,6 +468,7 @@ class InteractiveDemo:
                 if user_id:
                     self.current_user = user_id
                     self.mode = 'updating'
+                    self.motion_gate.force_refresh()
                     print(f"🔄 Updating {user_id}. Look at camera and press any key...")
             
             elif key == ord('s'):
@@ -376,7 +499,25 @@ class InteractiveDemo:
 
 def main():
     """Run the demo."""
-    demo = InteractiveDemo()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Interactive HDC identity verification demo')
+    parser.add_argument('--skip-duplicates', action='store_true',
+                       help='Skip near-duplicate enrollment frames and stop once the face stops '
+                            'changing (faster, fewer samples; accuracy not measured)')
+    parser.add_argument('--min-sample-change', type=float, default=0.01,
+                       help='Min landmark change, relative to face size, for a new sample (default: 0.01)')
+    parser.add_argument('--max-skipped-samples', type=int, default=5,
+                       help='Consecutive duplicates that count as converged (default: 5)')
+    parser.add_argument('--min-enroll-samples', type=int, default=20,
+                       help='Samples required before stopping early (default: 20)')
+    
+    args = parser.parse_args()
+    
+    demo = InteractiveDemo(skip_duplicate_samples=args.skip_duplicates,
+                           min_sample_change=args.min_sample_change,
+                           max_skipped_samples=args.max_skipped_samples,
+                           min_enroll_samples=args.min_enroll_samples)
     demo.run()
 
 
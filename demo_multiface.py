@@ -15,8 +15,13 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from identity_verifier import IdentityVerifier
+from drawing_utils import blend_rect
 import cv2
 import numpy as np
+import queue
+import threading
+import time
+import traceback
 
 # Color palette (modern, beautiful colors)
 COLORS = {
@@ -72,10 +77,8 @@ def draw_label_box(image, text, x, y, color, confidence=None):
     box_x2 = x + text_width + padding
     box_y2 = y + padding
     
-    # Create overlay for transparency
-    overlay = image.copy()
-    cv2.rectangle(overlay, (box_x1, box_y1), (box_x2, box_y2), color, -1)
-    cv2.addWeighted(overlay, 0.8, image, 0.2, 0, image)
+    # Blend background for transparency
+    blend_rect(image, box_x1, box_y1, box_x2, box_y2, color, 0.8)
     
     # Draw border
     cv2.rectangle(image, (box_x1, box_y1), (box_x2, box_y2), color, 2)
@@ -88,6 +91,63 @@ def draw_label_box(image, text, x, y, color, confidence=None):
         cv2.putText(image, conf_text, (x + text_width - conf_width, y - padding), 
                    font, font_scale * 0.8, COLORS['bg_light'], thickness)
 
+_DOT_STAMPS = {}
+
+def get_dot_stamp(radius):
+    """
+    Get (dy, dx) pixel offsets of a filled dot, cached per radius.
+    
+    The stamp is rasterized once with cv2.circle itself, so stamped dots
+    have exactly the pixels cv2.circle would draw for any radius.
+    """
+    if radius not in _DOT_STAMPS:
+        size = 2 * radius + 1
+        stamp = np.zeros((size, size), dtype=np.uint8)
+        cv2.circle(stamp, (radius, radius), radius, 1, -1)
+        dy, dx = np.nonzero(stamp)
+        _DOT_STAMPS[radius] = (dy - radius, dx - radius)
+    return _DOT_STAMPS[radius]
+
+def draw_keypoints(image, landmark_sets, colors, step=5, radius=2):
+    """
+    Draw landmark dots for all faces in one vectorized pass.
+    
+    Every step-th landmark of each face is stamped with a precomputed dot
+    and scattered into image in place, instead of one cv2.circle call per
+    point. Where dots overlap, the later point (in face order, then landmark
+    order) wins, the same as drawing them one by one with cv2.circle.
+    
+    Args:
+        image: BGR image to draw on (modified in place)
+        landmark_sets: List of (N, 2+) landmark arrays in pixel coordinates
+        colors: One BGR color per landmark set
+        step: Draw every step-th landmark (decimation)
+        radius: Dot radius in pixels
+    """
+    if not landmark_sets:
+        return
+    
+    h, w = image.shape[:2]
+    points = [np.asarray(landmarks)[::step, :2] for landmarks in landmark_sets]
+    counts = [len(p) for p in points]
+    points = np.concatenate(points).astype(np.int32)
+    point_colors = np.repeat(np.asarray(colors, dtype=image.dtype), counts, axis=0)
+    
+    dy, dx = get_dot_stamp(radius)
+    ys = points[:, 1:2] + dy
+    xs = points[:, 0:1] + dx
+    valid = (ys >= 0) & (ys < h) & (xs >= 0) & (xs < w)
+    
+    pixel_colors = np.broadcast_to(point_colors[:, None, :], ys.shape + (3,))[valid]
+    ys, xs = ys[valid], xs[valid]
+    
+    # NumPy does not define which write wins for repeated indices, so keep
+    # only the last occurrence of each pixel explicitly
+    flat = ys * w + xs
+    _, first_from_end = np.unique(flat[::-1], return_index=True)
+    last = len(flat) - 1 - first_from_end
+    image[ys[last], xs[last]] = pixel_colors[last]
+
 def get_face_bbox(landmarks):
     """Get bounding box from landmarks."""
     x_coords = landmarks[:, 0]
@@ -110,9 +170,7 @@ def draw_header(image, num_faces, num_enrolled):
     h, w = image.shape[:2]
     
     # Semi-transparent header bar
-    overlay = image.copy()
-    cv2.rectangle(overlay, (0, 0), (w, 80), COLORS['bg_dark'], -1)
-    cv2.addWeighted(overlay, 0.7, image, 0.3, 0, image)
+    blend_rect(image, 0, 0, w, 80, COLORS['bg_dark'], 0.7)
     
     # Title
     cv2.putText(image, "HDC MULTI-FACE RECOGNITION", (20, 35), 
@@ -132,14 +190,153 @@ def draw_footer(image, message="Press 'q' to quit | 'e' to enroll | 'i' for info
     h, w = image.shape[:2]
     
     # Semi-transparent footer bar
-    overlay = image.copy()
-    cv2.rectangle(overlay, (0, h - 40), (w, h), COLORS['bg_dark'], -1)
-    cv2.addWeighted(overlay, 0.7, image, 0.3, 0, image)
+    blend_rect(image, 0, h - 40, w, h, COLORS['bg_dark'], 0.7)
     
     # Message
     cv2.putText(image, message, (20, h - 15), 
                cv2.FONT_HERSHEY_SIMPLEX, 0.5, COLORS['text'], 1)
 
+class StageStats:
+    """Latency and throughput counters for one pipeline stage."""
+    
+    def __init__(self):
+        self.count = 0
+        self.dropped = 0
+        self.total_ms = 0.0
+        self.start_time = time.perf_counter()
+    
+    def record(self, elapsed_ms):
+        """Record one processed item."""
+        self.count += 1
+        self.total_ms += elapsed_ms
+    
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.count if self.count else 0.0
+    
+    @property
+    def fps(self):
+        elapsed = time.perf_counter() - self.start_time
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+
+def put_drop_oldest(q, item, stats):
+    """Put item on a bounded queue, discarding the oldest entry if it is full."""
+    while True:
+        try:
+            q.put_nowait(item)
+            return
+        except queue.Full:
+            try:
+                q.get_nowait()
+                stats.dropped += 1
+            except queue.Empty:
+                pass
+
+
+class FacePipeline:
+    """
+    Capture and recognition stages running on their own threads.
+    
+    Stages are connected by bounded queues that drop the oldest frame when
+    full, so a slow stage never builds up latency. Results come out tagged
+    with the frame id they were computed from, and throughput approaches
+    the slowest stage instead of the sum of all stages. Drawing stays on
+    the caller's (main) thread, as required by cv2.imshow.
+    """
+    
+    def __init__(self, cap, verifier, threshold=0.70, queue_size=2):
+        """
+        Initialize pipeline.
+        
+        Args:
+            cap: Opened cv2.VideoCapture
+            verifier: IdentityVerifier used by the recognition stage
+            threshold: Identification threshold for identify_all_faces
+            queue_size: Capacity of each inter-stage queue
+        """
+        self.cap = cap
+        self.verifier = verifier
+        self.threshold = threshold
+        self.frames = queue.Queue(maxsize=queue_size)
+        self.results = queue.Queue(maxsize=queue_size)
+        self.stats = {'capture': StageStats(), 'identify': StageStats()}
+        self.running = False
+        self.error = None
+        self.threads = []
+    
+    def start(self):
+        """Start the stage threads."""
+        self.running = True
+        self.threads = [
+            threading.Thread(target=self._run_stage, args=('capture', self._capture_loop),
+                             daemon=True),
+            threading.Thread(target=self._run_stage, args=('identify', self._identify_loop),
+                             daemon=True),
+        ]
+        for thread in self.threads:
+            thread.start()
+    
+    def stop(self, timeout=2.0):
+        """
+        Stop the stage threads and wait up to timeout seconds for them to exit.
+        
+        Both loops check self.running on every iteration, so they exit once
+        the current cap.read() or identify_all_faces() call finishes. A call
+        that hangs (e.g. an unplugged camera) must not block the demo from
+        quitting, so the wait is bounded; the threads are daemons.
+        
+        Returns:
+            True if every stage thread exited, i.e. it is safe to release the
+            camera and close the verifier
+        """
+        self.running = False
+        deadline = time.perf_counter() + timeout
+        for thread in self.threads:
+            thread.join(timeout=max(0.0, deadline - time.perf_counter()))
+        return not any(thread.is_alive() for thread in self.threads)
+    
+    def _run_stage(self, name, loop):
+        """Run a stage loop, stopping the whole pipeline if it raises."""
+        try:
+            loop()
+        except Exception as e:
+            traceback.print_exc()
+            self.error = f"{name} stage failed: {e}"
+            self.running = False
+    
+    def get_result(self, timeout=0.5):
+        """Get the next (frame_id, frame, face_results) tuple, or None on timeout."""
+        try:
+            return self.results.get(timeout=timeout)
+        except queue.Empty:
+            return None
+    
+    def _capture_loop(self):
+        frame_id = 0
+        while self.running:
+            start = time.perf_counter()
+            ret, frame = self.cap.read()
+            if not ret:
+                self.running = False
+                break
+            frame_id += 1
+            self.stats['capture'].record((time.perf_counter() - start) * 1000)
+            put_drop_oldest(self.frames, (frame_id, frame), self.stats['capture'])
+    
+    def _identify_loop(self):
+        while self.running:
+            try:
+                frame_id, frame = self.frames.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            start = time.perf_counter()
+            face_results = self.verifier.identify_all_faces(frame, threshold=self.threshold)
+            self.stats['identify'].record((time.perf_counter() - start) * 1000)
+            put_drop_oldest(self.results, (frame_id, frame, face_results),
+                            self.stats['identify'])
+
+
 def main():
     """Run multi-face recognition demo."""
     print("=" * 70)
@@ -180,27 +377,38 @@ def main():
     
     cv2.namedWindow('Multi-Face Recognition', cv2.WINDOW_NORMAL)
     
-    frame_count = 0
+    display = None  # Reused across frames to avoid a full-frame allocation
+    
+    # Capture and recognition run on background threads; drawing stays here
+    pipeline = FacePipeline(cap, verifier, threshold=0.70)
+    pipeline.start()
     
     while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
+        item = pipeline.get_result()
+        if item is None:
+            if not pipeline.running:
+                break
+            # Keep the window responsive while no results are arriving
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                print("\n👋 Quitting...")
+                break
+            continue
         
-        frame_count += 1
+        frame_id, frame, face_results = item
         h, w = frame.shape[:2]
         
-        # Create display frame
-        display = frame.copy()
+        # Create display frame (copy into the reused buffer)
+        if display is None or display.shape != frame.shape:
+            display = np.empty_like(frame)
+        np.copyto(display, frame)
         
-        # Identify all faces at once with stricter threshold
-        face_results = verifier.identify_all_faces(frame, threshold=0.70)
         num_faces = len(face_results)
         num_enrolled = len(verifier.get_enrolled_users())
         
         # Process each detected face
         recognized_count = 0
         unknown_count = 0
+        face_displays = []
         
         for result in face_results:
             landmarks = result['landmarks']
@@ -227,16 +435,21 @@ def main():
                 confidence = None
                 color = COLORS['info']
             
+            face_displays.append((landmarks, (x1, y1, x2, y2), name, confidence, color))
+        
+        # Draw keypoints for all faces first (every 5th point for better
+        # visibility), so no face's dots cover another face's box or label
+        draw_keypoints(display,
+                       [landmarks for landmarks, _, _, _, _ in face_displays],
+                       [color for _, _, _, _, color in face_displays],
+                       step=5, radius=2)
+        
+        for _, (x1, y1, x2, y2), name, confidence, color in face_displays:
             # Draw modern bounding box
             draw_modern_box(display, x1, y1, x2, y2, color, thickness=3)
             
             # Draw name label
             draw_label_box(display, name, x1 + 5, y1 - 5, color, confidence)
-            
-            # Draw keypoints (every 5th point for better visibility)
-            for i in range(0, len(landmarks), 5):
-                x, y = int(landmarks[i][0]), int(landmarks[i][1])
-                cv2.circle(display, (x, y), 2, color, -1)
         
         # Draw header
         draw_header(display, num_faces, num_enrolled)
@@ -264,14 +477,23 @@ def main():
             print(f"\n📊 System Info:")
             print(f"  Enrolled users: {num_enrolled}")
             print(f"  Current faces: {num_faces}")
-            print(f"  Frame: {frame_count}")
+            print(f"  Frame: {frame_id}")
             stats = verifier.get_stats()
             print(f"  Memory: {stats['memory_usage']['total_kb']:.1f} KB")
+            for name, stage in pipeline.stats.items():
+                print(f"  {name}: {stage.mean_ms:.1f} ms avg | "
+                      f"{stage.fps:.1f} FPS | {stage.dropped} dropped")
     
-    # Cleanup
-    cap.release()
+    # Cleanup (resources are only released once both stages have exited)
+    stopped = pipeline.stop()
+    if pipeline.error is not None:
+        print(f"\n❌ {pipeline.error}")
     cv2.destroyAllWindows()
-    verifier.close()
+    if stopped:
+        cap.release()
+        verifier.close()
+    else:
+        print("\n⚠️  Pipeline did not stop in time; leaving camera and verifier open")
     
     print("\n✅ Demo complete!")
 
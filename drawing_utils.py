@@ -0,0 +1,33 @@
+"""
+Drawing helpers shared by the webcam demos.
+"""
+
+import cv2
+import numpy as np
+
+
+def blend_rect(image: np.ndarray, x1: int, y1: int, x2: int, y2: int,
+               color: tuple, alpha: float):
+    """
+    Alpha-blend a filled rectangle into image in place.
+    
+    Gives the same pixels as filling the rectangle on a full-frame copy and
+    blending that copy back with cv2.addWeighted. Only the rectangle's region
+    is copied, so the cost depends on the rectangle's size, not the frame's.
+    
+    Args:
+        image: BGR image to draw on (modified in place)
+        x1, y1, x2, y2: Rectangle corners, inclusive as in cv2.rectangle
+        color: BGR fill color
+        alpha: Weight of the fill color (0-1)
+    """
+    h, w = image.shape[:2]
+    x1, y1 = max(0, x1), max(0, y1)
+    x2, y2 = min(w, x2 + 1), min(h, y2 + 1)
+    if x1 >= x2 or y1 >= y2:
+        return
+    
+    roi = image[y1:y2, x1:x2]
+    fill = np.empty_like(roi)
+    fill[:] = color
+    image[y1:y2, x1:x2] = cv2.addWeighted(fill, alpha, roi, 1 - alpha, 0)
@@ -0,0 +1,172 @@
+"""
+Tests for Interactive Demo Helpers (no webcam required)
+"""
+
+import pytest
+import numpy as np
+import sys
+import os
+import types
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+# The demo imports IdentityVerifier at module level; stub it when src/ is absent
+try:
+    import identity_verifier  # noqa: F401
+except ImportError:
+    stub = types.ModuleType('identity_verifier')
+    stub.IdentityVerifier = object
+    sys.modules['identity_verifier'] = stub
+
+from demo_identity_verification import MotionGate
+
+
+class TestMotionGate:
+    """Test suite for MotionGate."""
+    
+    @pytest.fixture
+    def frame(self):
+        """Create a static BGR frame."""
+        rng = np.random.default_rng(0)
+        return rng.integers(0, 256, size=(480, 640, 3), dtype=np.uint8)
+    
+    def test_first_frame_needs_detection(self, frame):
+        """Test that the first frame is always detected."""
+        gate = MotionGate()
+        assert gate.changed(frame)
+    
+    def test_static_frames_are_skipped(self, frame):
+        """Test that unchanged frames reuse previous results."""
+        gate = MotionGate(max_stale_frames=10)
+        gate.changed(frame)
+        
+        assert not any(gate.changed(frame) for _ in range(5))
+        assert gate.skipped == 5
+    
+    def test_staleness_bound_forces_refresh(self, frame):
+        """Test that a static scene is re-detected every max_stale_frames + 1 frames."""
+        gate = MotionGate(max_stale_frames=3)
+        decisions = [gate.changed(frame) for _ in range(9)]
+        
+        assert decisions == [True, False, False, False, True, False, False, False, True]
+        assert gate.skipped == 6
+    
+    def test_motion_triggers_detection(self, frame):
+        """Test that a changed scene is detected immediately."""
+        gate = MotionGate()
+        gate.changed(frame)
+        
+        moved = np.roll(frame, 80, axis=1)
+        assert gate.changed(moved)
+    
+    def test_force_refresh(self, frame):
+        """Test that force_refresh makes the next frame detect."""
+        gate = MotionGate()
+        gate.changed(frame)
+        gate.force_refresh()
+        assert gate.changed(frame)
+
+
+class FakeVerifier:
+    """
+    Stand-in for IdentityVerifier that completes enrollment at num_samples.
+    
+    Encodes the demo's assumption that enroll_user completes once its sample
+    count reaches the num_samples passed on that call.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        self.samples = 0
+    
+    def enroll_user(self, user_id, frame, num_samples=5):
+        self.samples += 1
+        if self.samples >= num_samples:
+            return {'success': True, 'num_samples': self.samples,
+                    'message': f"{user_id} enrolled successfully"}
+        return {'success': True, 'num_samples': self.samples, 'message': 'Sample collected'}
+
+
+class TestDuplicateSkippingEnrollment:
+    """Test suite for near-duplicate skipping during demo enrollment."""
+    
+    @pytest.fixture
+    def make_demo(self, monkeypatch):
+        """Create demos backed by FakeVerifier, without any UI."""
+        import demo_identity_verification
+        monkeypatch.setattr(demo_identity_verification, 'IdentityVerifier', FakeVerifier)
+        monkeypatch.setattr(demo_identity_verification.InteractiveDemo, 'show_result',
+                            lambda self, frame, result, duration=2000: None)
+        
+        def make(**kwargs):
+            demo = demo_identity_verification.InteractiveDemo(**kwargs)
+            demo.current_user = 'alice'
+            demo.mode = 'enrolling'
+            return demo
+        return make
+    
+    @pytest.fixture
+    def face(self):
+        """Create one face of 478 landmarks."""
+        rng = np.random.default_rng(1)
+        return rng.uniform(100, 400, size=(478, 3))
+    
+    def run_enrollment(self, demo, landmark_stream):
+        """Feed frames until enrollment completes; return frames consumed."""
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        for frames_used, landmarks in enumerate(landmark_stream, start=1):
+            demo.enroll_mode(frame, landmarks)
+            if demo.mode == 'idle':
+                return frames_used
+        raise AssertionError("enrollment never completed")
+    
+    def test_default_collects_all_target_samples(self, make_demo, face):
+        """Test that without skipping, every frame is enrolled up to the target."""
+        demo = make_demo()
+        frames_used = self.run_enrollment(demo, (face for _ in range(1000)))
+        
+        assert frames_used == 200
+        assert demo.verifier.samples == 200
+    
+    def test_still_face_stops_early(self, make_demo, face):
+        """Test that a converged (still) face finishes in far fewer frames than the target."""
+        demo = make_demo(skip_duplicate_samples=True, max_skipped_samples=5,
+                         min_enroll_samples=20)
+        frames_used = self.run_enrollment(demo, (face for _ in range(1000)))
+        
+        # One sample per K=5 frames until 20 samples, then K more frames to finish
+        assert frames_used == 101  # About half of target_samples (200)
+        assert demo.verifier.samples == 21
+    
+    def test_moving_face_is_not_skipped(self, make_demo):
+        """Test that clearly different face shapes are all enrolled."""
+        rng = np.random.default_rng(2)
+        demo = make_demo(skip_duplicate_samples=True)
+        stream = (rng.uniform(100, 400, size=(478, 3)) for _ in range(1000))
+        frames_used = self.run_enrollment(demo, stream)
+        
+        assert frames_used == 200
+        assert demo.verifier.samples == 200
+    
+    def test_min_enroll_samples_before_stopping(self, make_demo, face):
+        """Test that enrollment does not stop before min_enroll_samples are accepted."""
+        demo = make_demo(skip_duplicate_samples=True, max_skipped_samples=3,
+                         min_enroll_samples=10)
+        frames_used = self.run_enrollment(demo, (face for _ in range(1000)))
+        
+        assert demo.verifier.samples == 11
+        assert frames_used == 31
+    
+    def test_convergence_after_movement(self, make_demo):
+        """Test that a face that moves, then holds still, stops once it has settled."""
+        rng = np.random.default_rng(3)
+        moving = [rng.uniform(100, 400, size=(478, 3)) for _ in range(30)]
+        still = moving[-1]
+        stream = iter(moving + [still] * 1000)
+        
+        demo = make_demo(skip_duplicate_samples=True, max_skipped_samples=5,
+                         min_enroll_samples=20)
+        frames_used = self.run_enrollment(demo, stream)
+        
+        assert demo.verifier.samples == 31
+        assert frames_used == 35
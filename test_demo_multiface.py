@@ -0,0 +1,196 @@
+"""
+Tests for Multi-Face Demo Helpers (no webcam required)
+"""
+
+import pytest
+import numpy as np
+import cv2
+import queue
+import sys
+import os
+import threading
+import time
+import types
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+# The demo imports IdentityVerifier at module level; stub it when src/ is absent
+try:
+    import identity_verifier  # noqa: F401
+except ImportError:
+    stub = types.ModuleType('identity_verifier')
+    stub.IdentityVerifier = object
+    sys.modules['identity_verifier'] = stub
+
+from demo_multiface import draw_keypoints, put_drop_oldest, StageStats, FacePipeline
+
+
+def draw_keypoints_reference(image, landmark_sets, colors, step, radius):
+    """Reference: one cv2.circle call per point, as the demo used to draw."""
+    for landmarks, color in zip(landmark_sets, colors):
+        for i in range(0, len(landmarks), step):
+            x, y = int(landmarks[i][0]), int(landmarks[i][1])
+            cv2.circle(image, (x, y), radius, color, -1)
+
+
+class TestDrawKeypoints:
+    """Test suite for draw_keypoints."""
+    
+    @pytest.fixture
+    def faces(self):
+        """Create two non-overlapping faces of 478 landmarks in pixel coordinates."""
+        rng = np.random.default_rng(7)
+        left = rng.uniform([0, 0, -1], [300, 480, 1], size=(478, 3))
+        right = rng.uniform([340, 0, -1], [640, 480, 1], size=(478, 3))
+        # Points on and past the frame border exercise clipping
+        left[:4, :2] = [[0, 0], [-1.5, 10], [639.9, 479.9], [2, 481]]
+        return [left, right]
+    
+    @pytest.mark.parametrize("radius", [1, 2, 3, 4])
+    @pytest.mark.parametrize("step", [1, 5])
+    def test_matches_cv2_circle(self, faces, radius, step):
+        """Test that vectorized dots equal per-point cv2.circle drawing."""
+        colors = [(0, 255, 100), (0, 165, 255)]
+        expected = np.zeros((480, 640, 3), dtype=np.uint8)
+        draw_keypoints_reference(expected, faces, colors, step, radius)
+        
+        image = np.zeros((480, 640, 3), dtype=np.uint8)
+        draw_keypoints(image, faces, colors, step=step, radius=radius)
+        
+        assert np.array_equal(image, expected)
+    
+    @pytest.mark.parametrize("radius", [1, 2, 3])
+    def test_overlapping_faces_match_drawing_order(self, radius):
+        """Test that overlapping dots keep the color of the last-drawn point."""
+        rng = np.random.default_rng(11)
+        # Three faces packed into the same small area so many dots collide
+        faces = [rng.uniform([20, 20, 0], [60, 60, 1], size=(478, 3)) for _ in range(3)]
+        colors = [(0, 255, 100), (0, 165, 255), (255, 200, 0)]
+        expected = np.zeros((80, 80, 3), dtype=np.uint8)
+        draw_keypoints_reference(expected, faces, colors, 1, radius)
+        
+        image = np.zeros((80, 80, 3), dtype=np.uint8)
+        draw_keypoints(image, faces, colors, step=1, radius=radius)
+        
+        assert np.array_equal(image, expected)
+    
+    def test_no_faces_is_noop(self):
+        """Test that drawing no faces leaves the image untouched."""
+        image = np.zeros((48, 64, 3), dtype=np.uint8)
+        draw_keypoints(image, [], [])
+        assert not image.any()
+
+
+class FakeCapture:
+    """Stand-in for cv2.VideoCapture that yields a fixed number of frames."""
+    
+    def __init__(self, num_frames):
+        self.remaining = num_frames
+    
+    def read(self):
+        if self.remaining == 0:
+            return False, None
+        self.remaining -= 1
+        time.sleep(0.001)
+        return True, np.zeros((48, 64, 3), dtype=np.uint8)
+
+
+class FakeVerifier:
+    """Stand-in for IdentityVerifier that can fail on demand."""
+    
+    def __init__(self, fail=False):
+        self.fail = fail
+    
+    def identify_all_faces(self, frame, threshold=0.7):
+        if self.fail:
+            raise RuntimeError("detector crashed")
+        return []
+
+
+class TestPutDropOldest:
+    """Test suite for put_drop_oldest."""
+    
+    def test_puts_without_dropping_when_room(self):
+        """Test that items are queued normally while there is room."""
+        q = queue.Queue(maxsize=2)
+        stats = StageStats()
+        put_drop_oldest(q, 1, stats)
+        put_drop_oldest(q, 2, stats)
+        
+        assert stats.dropped == 0
+        assert [q.get_nowait(), q.get_nowait()] == [1, 2]
+    
+    def test_drops_oldest_when_full(self):
+        """Test that a full queue discards its oldest items and counts them."""
+        q = queue.Queue(maxsize=2)
+        stats = StageStats()
+        for item in range(5):
+            put_drop_oldest(q, item, stats)
+        
+        assert stats.dropped == 3
+        assert [q.get_nowait(), q.get_nowait()] == [3, 4]
+
+
+class TestFacePipeline:
+    """Test suite for FacePipeline with fake capture and verifier."""
+    
+    def test_results_tagged_with_increasing_frame_ids(self):
+        """Test that results arrive tagged with frame ids in capture order."""
+        pipeline = FacePipeline(FakeCapture(20), FakeVerifier(), queue_size=2)
+        pipeline.start()
+        
+        frame_ids = []
+        while True:
+            item = pipeline.get_result(timeout=0.2)
+            if item is None:
+                if not pipeline.running:
+                    break
+                continue
+            frame_ids.append(item[0])
+        pipeline.stop()
+        
+        assert frame_ids
+        assert frame_ids == sorted(frame_ids)
+        assert pipeline.stats['capture'].count == 20
+        assert pipeline.error is None
+    
+    def test_stage_error_stops_pipeline(self):
+        """Test that an exception in a stage stops the pipeline and is recorded."""
+        pipeline = FacePipeline(FakeCapture(1000), FakeVerifier(fail=True))
+        pipeline.start()
+        
+        deadline = time.time() + 5
+        while pipeline.running and time.time() < deadline:
+            time.sleep(0.01)
+        pipeline.stop()
+        
+        assert not pipeline.running
+        assert "identify stage failed: detector crashed" in pipeline.error
+    
+    def test_stop_waits_for_threads(self):
+        """Test that stop() returns only after both stage threads have exited."""
+        pipeline = FacePipeline(FakeCapture(10 ** 6), FakeVerifier())
+        pipeline.start()
+        
+        assert pipeline.stop()
+        assert not any(thread.is_alive() for thread in pipeline.threads)
+    
+    def test_stop_is_bounded_when_capture_hangs(self):
+        """Test that a hanging cap.read() cannot block stop() forever."""
+        release = threading.Event()
+        
+        class HangingCapture:
+            def read(self):
+                release.wait()
+                return False, None
+        
+        pipeline = FacePipeline(HangingCapture(), FakeVerifier())
+        pipeline.start()
+        
+        start = time.perf_counter()
+        assert not pipeline.stop(timeout=0.2)
+        assert time.perf_counter() - start < 1.0
+        
+        release.set()
+        assert pipeline.stop()
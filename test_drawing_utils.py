@@ -0,0 +1,52 @@
+"""
+Tests for Demo Drawing Helpers
+"""
+
+import pytest
+import numpy as np
+import cv2
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from drawing_utils import blend_rect
+
+
+def blend_full_frame(image, x1, y1, x2, y2, color, alpha):
+    """Reference: the full-frame overlay blend the demos used before."""
+    overlay = image.copy()
+    cv2.rectangle(overlay, (x1, y1), (x2, y2), color, -1)
+    cv2.addWeighted(overlay, alpha, image, 1 - alpha, 0, image)
+
+
+class TestBlendRect:
+    """Test suite for blend_rect."""
+    
+    @pytest.fixture
+    def frame(self):
+        """Create a random BGR frame."""
+        rng = np.random.default_rng(42)
+        return rng.integers(0, 256, size=(480, 640, 3), dtype=np.uint8)
+    
+    @pytest.mark.parametrize("rect", [
+        (0, 0, 640, 80),        # Header band (x2 past the right edge)
+        (0, 440, 640, 480),     # Footer band (y2 past the bottom edge)
+        (120, 165, 520, 315),   # Centered result box
+        (-10, -25, 60, 15),     # Label box partly above/left of the frame
+    ])
+    @pytest.mark.parametrize("alpha", [0.6, 0.7, 0.8])
+    def test_matches_full_frame_blend(self, frame, rect, alpha):
+        """Test that ROI blending matches the old full-frame overlay blend."""
+        expected = frame.copy()
+        blend_full_frame(expected, *rect, (20, 20, 20), alpha)
+        
+        blend_rect(frame, *rect, (20, 20, 20), alpha)
+        
+        assert np.array_equal(frame, expected)
+    
+    def test_rect_outside_frame_is_noop(self, frame):
+        """Test that a rectangle entirely outside the frame changes nothing."""
+        original = frame.copy()
+        blend_rect(frame, 700, 500, 800, 600, (0, 0, 255), 0.8)
+        assert np.array_equal(frame, original)
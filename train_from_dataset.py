@@ -75,6 +75,7 @@ def train_from_folder(data_folder: str, model_save_path: str):
         print(f"\n📝 Enrolling {person_name} ({len(image_files)} images)...")
         
         samples_enrolled = 0
+        failures = 0
         
         # Enroll each image
         for img_path in image_files:
@@ -82,21 +83,33 @@ def train_from_folder(data_folder: str, model_save_path: str):
             img = cv2.imread(img_path)
             if img is None:
                 print(f"  ⚠️  Could not read {os.path.basename(img_path)}")
+                failures += 1
                 continue
             
-            # Enroll
-            result = verifier.enroll_user(person_name, img, num_samples=len(image_files))
+            # The target shrinks with every unreadable image or failed detection.
+            # Unverified assumption: IdentityVerifier.enroll_user (src/, not in
+            # this tree) reads num_samples on every call and completes once its
+            # sample count reaches it. If it only honours the first value, the
+            # target stays at len(image_files) as before.
+            target = len(image_files) - failures
+            result = verifier.enroll_user(person_name, img, num_samples=target)
             
             if result['success']:
                 samples_enrolled = result['num_samples']
-                print(f"  ✅ Sample {samples_enrolled}/{len(image_files)}: {os.path.basename(img_path)}")
+                print(f"  ✅ Sample {samples_enrolled}/{target}: {os.path.basename(img_path)}")
             else:
+                failures += 1
                 print(f"  ❌ Failed: {result['message']}")
         
-        if 'enrolled successfully' in verifier.get_enrolled_users():
+        if person_name in verifier.get_enrolled_users():
             total_enrolled += 1
             total_samples += samples_enrolled
             print(f"  🎉 {person_name} enrolled with {samples_enrolled} samples!")
+        elif samples_enrolled > 0:
+            # The target is only reached on a successful sample, so failures
+            # among the last images leave the enrollment incomplete
+            print(f"  ⚠️  {person_name} not enrolled: last images failed after "
+                  f"{samples_enrolled} samples")
     
     # Training summary
     print("\n" + "=" * 70)